@@ -3,74 +3,228 @@
 
 import argparse
 import datetime
+import functools
 import hashlib
-import json
+import html
 import logging
+import operator
 import os
 import random
 import re
 import smtplib
+import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
 
+import ahocorasick
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger(__name__)
 
 REPO_ROOT = Path(__file__).resolve().parent
 CONFIG_PATH = REPO_ROOT / "config.json"
-SEEN_JOBS_PATH = REPO_ROOT / "seen_jobs.json"
+SEEN_DB_PATH = REPO_ROOT / "seen_jobs.sqlite"
+LEGACY_SEEN_JSON_PATH = REPO_ROOT / "seen_jobs.json"
+LEGACY_SEEN_TXT_PATH = REPO_ROOT / "seen_jobs.txt"
+LEGACY_LAST_RUN_PATH = REPO_ROOT / "last_run.txt"
 QUOTES_PATH = REPO_ROOT / "quotes.json"
+
+DEFAULT_SEEN_TTL_DAYS = 45  # Postings expire well before this
+DEFAULT_FILTERED_TTL_DAYS = 7  # Rejected jobs may be edited/reposted; re-check sooner
 ENV_PATH = REPO_ROOT / ".env"
 
+# Shared HTTP session: keep-alive + connection pooling means one TLS handshake
+# for the whole run instead of one per query, with retries on transient errors.
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = "medtech-job-alerts/1.0"
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
 
 def load_dotenv():
     """Load .env file into os.environ if it exists (for local dev)."""
     if not ENV_PATH.exists():
         return
-    with open(ENV_PATH) as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            os.environ.setdefault(key.strip(), value.strip())
+    parsed = {}
+    for line in ENV_PATH.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        parsed[key.strip()] = value.strip()
+    # Real env vars win over .env values, as before
+    os.environ.update({k: v for k, v in parsed.items() if k not in os.environ})
 
 
+@functools.lru_cache(maxsize=1)
 def load_config():
-    with open(CONFIG_PATH) as f:
-        return json.load(f)
+    return orjson.loads(CONFIG_PATH.read_bytes())
+
+
+@functools.lru_cache(maxsize=1)
+def _load_quotes():
+    return orjson.loads(QUOTES_PATH.read_bytes())["quotes"]
 
 
 def get_daily_quote():
     """Pick a random motivational quote for the day."""
-    with open(QUOTES_PATH) as f:
-        data = json.load(f)
-    return random.choice(data["quotes"])
+    return random.choice(_load_quotes())
+
+
+def utc_now_iso():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
 
+def _ttl_cutoff(ttl_days):
+    """ISO timestamp before which entries are expired. Timestamps are always
+    written by utc_now_iso, so string comparison is a valid chronological
+    order."""
+    return (datetime.datetime.now(datetime.timezone.utc)
+            - datetime.timedelta(days=ttl_days)).isoformat()
+
+
+class SeenStore:
+    """SQLite-backed dedup state: shown and filtered-out job IDs (each on its
+    own TTL) plus per-query result-page hashes.
+
+    Membership checks are indexed lookups and pruning is a single DELETE, so
+    startup no longer deserializes the entire seen history into memory, and
+    saving no longer rewrites the whole file.
+    """
+
+    def __init__(self, path=SEEN_DB_PATH,
+                 ttl_days=DEFAULT_SEEN_TTL_DAYS, filtered_ttl_days=DEFAULT_FILTERED_TTL_DAYS):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY, seen_at TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS filtered (id TEXT PRIMARY KEY, seen_at TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS bunches (query_key TEXT PRIMARY KEY, page_hash TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(cache_key TEXT PRIMARY KEY, body_hash TEXT NOT NULL, jobs BLOB NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+        self._migrate_legacy_files()
+        self.conn.execute("DELETE FROM seen WHERE seen_at < ?", (_ttl_cutoff(ttl_days),))
+        self.conn.execute("DELETE FROM filtered WHERE seen_at < ?", (_ttl_cutoff(filtered_ttl_days),))
+
+    def _migrate_legacy_files(self):
+        """One-time import from the old JSON/text dedup files."""
+        if self.conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone():
+            return
+        now = utc_now_iso()
+        seen_rows, filtered_rows, bunch_rows = [], [], []
+        if LEGACY_SEEN_JSON_PATH.exists():
+            data = orjson.loads(LEGACY_SEEN_JSON_PATH.read_bytes())
+            if "seen" in data:
+                seen_rows = list(data["seen"].items())
+                filtered_rows = list(data.get("filtered", {}).items())
+                bunch_rows = list(data.get("bunches", {}).items())
+            else:
+                # Oldest format: flat list of IDs with no timestamps
+                seen_rows = [(jid, now) for jid in data.get("seen_ids", [])]
+        elif LEGACY_SEEN_TXT_PATH.exists():
+            seen_rows = [(jid, now) for jid in LEGACY_SEEN_TXT_PATH.read_text().splitlines()]
+        self.conn.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?)", seen_rows)
+        self.conn.executemany("INSERT OR IGNORE INTO filtered VALUES (?, ?)", filtered_rows)
+        self.conn.executemany("INSERT OR REPLACE INTO bunches VALUES (?, ?)", bunch_rows)
+
+    def seen_contains(self, jid):
+        return self.conn.execute("SELECT 1 FROM seen WHERE id = ?", (jid,)).fetchone() is not None
+
+    def filtered_contains(self, jid):
+        return self.conn.execute("SELECT 1 FROM filtered WHERE id = ?", (jid,)).fetchone() is not None
+
+    def mark_seen(self, jid, ts):
+        self.conn.execute("INSERT OR IGNORE INTO seen VALUES (?, ?)", (jid, ts))
+
+    def mark_filtered(self, jid, ts):
+        self.conn.execute("INSERT OR IGNORE INTO filtered VALUES (?, ?)", (jid, ts))
+
+    def count_filtered(self):
+        return self.conn.execute("SELECT COUNT(*) FROM filtered").fetchone()[0]
+
+    def get_bunch(self, query_key):
+        row = self.conn.execute(
+            "SELECT page_hash FROM bunches WHERE query_key = ?", (query_key,)).fetchone()
+        return row[0] if row else None
+
+    def set_bunch(self, query_key, page_hash):
+        self.conn.execute("INSERT OR REPLACE INTO bunches VALUES (?, ?)", (query_key, page_hash))
+
+    def load_responses(self):
+        """All cached responses as {cache_key: (body_hash, jobs_bytes)}."""
+        return {
+            key: (body_hash, jobs)
+            for key, body_hash, jobs in self.conn.execute(
+                "SELECT cache_key, body_hash, jobs FROM responses")
+        }
+
+    def save_responses(self, response_cache):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+            [(key, body_hash, jobs) for key, (body_hash, jobs) in response_cache.items()],
+        )
 
-def load_seen_jobs():
-    if SEEN_JOBS_PATH.exists():
-        with open(SEEN_JOBS_PATH) as f:
-            return json.load(f)
-    return {"seen_ids": [], "last_run": None}
+    def commit(self):
+        """Commit the run's writes in one transaction and retire legacy files."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('last_run', ?)", (utc_now_iso(),))
+        self.conn.commit()
+        LEGACY_SEEN_JSON_PATH.unlink(missing_ok=True)
+        LEGACY_SEEN_TXT_PATH.unlink(missing_ok=True)
+        LEGACY_LAST_RUN_PATH.unlink(missing_ok=True)
 
 
-def save_seen_jobs(data):
-    data["last_run"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-    with open(SEEN_JOBS_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+def _prepare_job(job):
+    """Lowercase each text field exactly once and cache it on the job dict.
+
+    Filtering, scoring, and bucketing all read these keys so no job field is
+    lowercased or concatenated more than once.
+    """
+    job["_title_lc"] = job.get("title", "").lower()
+    job["_company_lc"] = job.get("company_name", "").lower()
+    job["_desc_lc"] = job.get("description", "").lower()
+    job["_loc_lc"] = job.get("location", "").lower()
+    job["_text_lc"] = f"{job['_title_lc']} {job['_company_lc']} {job['_desc_lc']}"
 
 
 def make_job_id(job):
     """Create a stable ID from job title + company + location."""
     raw = f"{job.get('title', '')}-{job.get('company_name', '')}-{job.get('location', '')}".lower()
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def legacy_job_id(job):
+    """Old MD5 job ID, kept so pre-migration seen_jobs entries still dedup."""
+    raw = f"{job.get('title', '')}-{job.get('company_name', '')}-{job.get('location', '')}".lower()
     return hashlib.md5(raw.encode()).hexdigest()
 
 
+def bunch_hash(jobs):
+    """Hash the identifying fields of a whole result page.
+
+    If a query returns the exact same page as last run, the hash matches and
+    per-job dedup/filter/score work can be skipped wholesale. Descriptions
+    are included so an edited posting (e.g. senior requirements dropped)
+    changes the hash and gets re-examined once its filtered entry expires.
+    """
+    key_fields = [
+        (j.get("title"), j.get("company_name"), j.get("location"), j.get("description"))
+        for j in jobs
+    ]
+    return hashlib.blake2b(orjson.dumps(key_fields), digest_size=16).hexdigest()
+
+
 # ── Entry-level filtering ──────────────────────────────────────────
 
 EXCLUDE_TITLE_KEYWORDS = [
@@ -88,30 +242,33 @@ YOE_PATTERN = re.compile(r"(\d+)\+?\s*(?:-\s*\d+\s*)?years?", re.IGNORECASE)
 MAX_YOE = 2  # Exclude jobs requiring more than this
 
 
-def is_entry_level_relevant(job):
-    """Filter out senior roles, non-sales noise, and 3+ YOE requirements."""
-    title = job.get("title", "").lower()
-    description = job.get("description", "").lower()
+def build_automaton(tagged_words):
+    """Build an Aho-Corasick automaton from (word, tag) pairs.
 
-    # Exclude senior titles
-    for kw in EXCLUDE_TITLE_KEYWORDS:
-        if kw in title:
-            log.debug(f"  Filtered out (senior title): {job.get('title')}")
-            return False
+    One automaton scan finds every keyword occurrence in a single pass over
+    the text, regardless of how many keywords are in the set.
+    """
+    automaton = ahocorasick.Automaton()
+    for word, tag in tagged_words:
+        automaton.add_word(word, tag)
+    automaton.make_automaton()
+    return automaton
 
-    # Must be sales/clinical related
-    if not any(kw in title for kw in REQUIRE_TITLE_KEYWORDS):
-        log.debug(f"  Filtered out (not relevant): {job.get('title')}")
-        return False
 
-    # Check description for YOE requirements > 2
-    for match in YOE_PATTERN.finditer(description):
-        years = int(match.group(1))
-        if years > MAX_YOE:
-            log.debug(f"  Filtered out ({years}+ YOE): {job.get('title')}")
-            return False
+def scan_hits(automaton, text):
+    """Return the set of distinct tags from `automaton` found in `text`."""
+    return {tag for _, tag in automaton.iter(text)}
+
+
+def tagged(category, keywords):
+    """Tag each keyword with its category for a combined automaton."""
+    return [(kw, (category, kw)) for kw in keywords]
+
 
-    return True
+# Both title rules share one automaton so the title is scanned exactly once.
+TITLE_AC = build_automaton(
+    tagged("exclude", EXCLUDE_TITLE_KEYWORDS) + tagged("require", REQUIRE_TITLE_KEYWORDS)
+)
 
 
 # ── Relevancy scoring ──────────────────────────────────────────────
@@ -129,33 +286,10 @@ MED_RELEVANCE_KEYWORDS = [
     "territory", "field sales",
 ]
 
+STAFFING_KEYWORDS = ["staffing", "recruiting", "placement"]
 
-def relevancy_score(job):
-    """Score a job 0-100 for relevancy. Higher = better match."""
-    title = job.get("title", "").lower()
-    company = job.get("company_name", "").lower()
-    description = job.get("description", "").lower()
-    text = f"{title} {company} {description}"
-
-    score = 50  # baseline
-
-    for kw in HIGH_RELEVANCE_KEYWORDS:
-        if kw in text:
-            score += 10
-    for kw in MED_RELEVANCE_KEYWORDS:
-        if kw in text:
-            score += 5
-
-    # Boost for "associate" or "entry" in title specifically
-    if "associate" in title or "entry" in title or "junior" in title:
-        score += 15
-
-    # Penalize if it smells like a staffing/recruiting farm
-    if any(x in company for x in ["staffing", "recruiting", "placement"]):
-        score -= 10
-
-    # Boost well-known med device / medtech / medical companies
-    known_companies = [
+# Well-known med device / medtech / medical companies
+KNOWN_COMPANIES = [
         # Big medtech / diversified
         "stryker", "medtronic", "johnson & johnson", "j&j", "johnson johnson",
         "abbott", "baxter", "becton dickinson", "bd ", "boston scientific",
@@ -205,24 +339,39 @@ def relevancy_score(job):
         "procept biorobotics", "transmedics", "inspire medical",
         "acutus medical", "zynex medical", "surmodics",
         "cardiovascular systems", "repligen",
-    ]
-    for co in known_companies:
-        if co in company:
-            score += 15
-            break
+]
 
-    return min(score, 100)
+# Both relevance tiers scan the combined text together; both company checks
+# scan the company name together.
+TEXT_AC = build_automaton(
+    tagged("high", HIGH_RELEVANCE_KEYWORDS) + tagged("med", MED_RELEVANCE_KEYWORDS)
+)
+COMPANY_AC = build_automaton(
+    tagged("staffing", STAFFING_KEYWORDS) + tagged("known", KNOWN_COMPANIES)
+)
+
+# Most postings from known companies use the bare name, so an O(1) set
+# lookup usually settles the company boost before any scanning. Names like
+# "Stryker Corporation" still fall through to the substring scan.
+KNOWN_COMPANY_EXACT = frozenset(co.strip() for co in KNOWN_COMPANIES)
 
 
 def sort_by_relevancy(jobs):
-    """Sort jobs by relevancy score, highest first."""
-    return sorted(jobs, key=relevancy_score, reverse=True)
+    """Sort jobs by their precomputed relevancy score, highest first."""
+    return sorted(jobs, key=operator.itemgetter("_score"), reverse=True)
 
 
 # ── SerpAPI ────────────────────────────────────────────────────────
 
-def query_serpapi(term, location, api_key, max_results=10):
-    """Query SerpAPI Google Jobs and return a list of job dicts."""
+def query_serpapi(term, location, api_key, max_results=10, response_cache=None):
+    """Query SerpAPI Google Jobs and return a list of job dicts.
+
+    `response_cache` maps cache keys to (body_hash, jobs_bytes) from previous
+    runs; if the response body hashes the same as last time (e.g. a CI
+    re-run), the much smaller cached jobs list is decoded instead of the full
+    response. Each (term, location, num) key is touched by exactly one worker,
+    so the shared dict needs no locking.
+    """
     params = {
         "engine": "google_jobs",
         "q": term,
@@ -234,13 +383,22 @@ def query_serpapi(term, location, api_key, max_results=10):
     }
     log.info(f"Querying: '{term}' in {location}")
     try:
-        resp = requests.get("https://serpapi.com/search", params=params, timeout=30)
+        resp = SESSION.get("https://serpapi.com/search", params=params, timeout=30)
         resp.raise_for_status()
-        data = resp.json()
+        cache_key = f"{term} | {location} | {max_results}"
+        body_hash = hashlib.blake2b(resp.content, digest_size=16).hexdigest()
+        cached = response_cache.get(cache_key) if response_cache is not None else None
+        if cached is not None and cached[0] == body_hash:
+            jobs = orjson.loads(cached[1])
+            log.info(f"  -> {len(jobs)} results (unchanged body, cached parse)")
+            return jobs
+        data = orjson.loads(resp.content)
         jobs = data.get("jobs_results", [])
+        if response_cache is not None:
+            response_cache[cache_key] = (body_hash, orjson.dumps(jobs))
         log.info(f"  -> {len(jobs)} results")
         return jobs
-    except requests.RequestException as e:
+    except (requests.RequestException, orjson.JSONDecodeError) as e:
         log.error(f"  -> API error: {e}")
         return []
 
@@ -280,21 +438,33 @@ METRO_ALIASES = {
 }
 
 
-def bucket_job_to_metro(job, queried_metro):
-    """Determine which metro a job actually belongs to based on its location field."""
-    location = job.get("location", "").lower()
+# Inverted alias -> metro lookup, and one automaton over every alias tagged
+# with (alias, metro), so bucketing is a single scan of the location string
+# instead of ~110 substring checks.
+ALIAS_TO_METRO = {
+    alias: metro
+    for metro, aliases in METRO_ALIASES.items()
+    for alias in aliases
+}
+METRO_AC = build_automaton(
+    (alias, (alias, metro)) for alias, metro in ALIAS_TO_METRO.items()
+)
 
-    # Check if it matches the metro we queried for
-    if queried_metro in METRO_ALIASES:
-        for alias in METRO_ALIASES[queried_metro]:
-            if alias in location:
-                return queried_metro
 
-    # Check all other metros in case it's a better fit
-    for metro, aliases in METRO_ALIASES.items():
-        for alias in aliases:
-            if alias in location:
-                return metro
+def bucket_job_to_metro(job, queried_metro):
+    """Determine which metro a job actually belongs to based on its location field."""
+    location = job["_loc_lc"]
+
+    # One scan: the queried metro wins outright, otherwise the longest
+    # (most specific) alias hit decides.
+    best = None
+    for _, (alias, metro) in METRO_AC.iter(location):
+        if metro == queried_metro:
+            return queried_metro
+        if best is None or len(alias) > len(best[0]):
+            best = (alias, metro)
+    if best:
+        return best[1]
 
     # If "anywhere" or "remote" or "united states", bucket under queried metro
     if any(x in location for x in ["remote", "anywhere", "united states"]):
@@ -304,51 +474,129 @@ def bucket_job_to_metro(job, queried_metro):
     return "Other"
 
 
+def process_job_fused(job, queried_metro, store, run_stamp):
+    """Dedup, filter, score, and bucket a job in one fused pass.
+
+    Each text field is lowercased once and scanned by one combined automaton,
+    instead of separate filter/score/bucket passes re-walking the same
+    strings. Returns the metro to file the job under, or None if it was
+    deduped or filtered out; accepted jobs get their score cached as
+    job["_score"].
+    """
+    jid = make_job_id(job)
+    if store.seen_contains(jid) or store.filtered_contains(jid):
+        return None
+    # Entries written before the BLAKE2b switch are MD5; check those too
+    # so the migration doesn't re-send every known job once.
+    if store.seen_contains(legacy_job_id(job)):
+        store.mark_seen(jid, run_stamp)
+        return None
+
+    _prepare_job(job)
+    title = job["_title_lc"]
+
+    # Title scan: senior-title excludes and sales/clinical requires together.
+    # Rejected jobs go in the short-TTL filtered set so a posting that is
+    # later edited to entry-level can still be picked up.
+    title_cats = {cat for cat, _ in scan_hits(TITLE_AC, title)}
+    if "exclude" in title_cats:
+        log.debug(f"  Filtered out (senior title): {job.get('title')}")
+        store.mark_filtered(jid, run_stamp)
+        return None
+    if "require" not in title_cats:
+        log.debug(f"  Filtered out (not relevant): {job.get('title')}")
+        store.mark_filtered(jid, run_stamp)
+        return None
+
+    # YOE requirements > 2; the cheap substring test means most descriptions
+    # never invoke the regex engine at all
+    description = job["_desc_lc"]
+    if "year" in description:
+        for match in YOE_PATTERN.finditer(description):
+            years = int(match.group(1))
+            if years > MAX_YOE:
+                log.debug(f"  Filtered out ({years}+ YOE): {job.get('title')}")
+                store.mark_filtered(jid, run_stamp)
+                return None
+
+    # Relevancy score 0-100: 50 baseline, +10/+5 per distinct high/med
+    # keyword, entry-level title and known-company boosts, staffing penalty
+    score = 50
+    text_tags = scan_hits(TEXT_AC, job["_text_lc"])
+    score += 10 * sum(1 for cat, _ in text_tags if cat == "high")
+    score += 5 * sum(1 for cat, _ in text_tags if cat == "med")
+    if "associate" in title or "entry" in title or "junior" in title:
+        score += 15
+    company = job["_company_lc"]
+    if company.strip() in KNOWN_COMPANY_EXACT:
+        score += 15
+    else:
+        company_cats = {cat for cat, _ in scan_hits(COMPANY_AC, company)}
+        if "staffing" in company_cats:
+            score -= 10
+        if "known" in company_cats:
+            score += 15
+    job["_score"] = min(score, 100)
+
+    store.mark_seen(jid, run_stamp)
+    return bucket_job_to_metro(job, queried_metro)
+
+
 def collect_jobs(config, api_key):
     """Run all queries and return {metro: [job, ...]} with dedup, filtering, and correct bucketing."""
-    seen = load_seen_jobs()
-    seen_ids = set(seen["seen_ids"])
+    store = SeenStore(
+        ttl_days=config.get("seen_ttl_days", DEFAULT_SEEN_TTL_DAYS),
+        filtered_ttl_days=config.get("filtered_ttl_days", DEFAULT_FILTERED_TTL_DAYS),
+    )
+    run_stamp = utc_now_iso()
+    initial_filtered = store.count_filtered()
     all_new_jobs = {}  # metro -> list of jobs
-    filtered_count = 0
-
-    def process_job(job, queried_metro):
-        nonlocal filtered_count
-        jid = make_job_id(job)
-        if jid in seen_ids:
-            return
-        seen_ids.add(jid)
-        if not is_entry_level_relevant(job):
-            filtered_count += 1
-            return
-        actual_metro = bucket_job_to_metro(job, queried_metro)
-        all_new_jobs.setdefault(actual_metro, []).append(job)
 
-    # Priority metro: Chicago gets all search terms
+    # Build the full (term, metro) task list: Chicago gets all search terms,
+    # then ALL secondary metros with rotated search terms
     priority = config["priority_metro"]
-    priority_terms = pick_search_terms(config, priority["queries_per_run"])
-    for term in priority_terms:
-        for job in query_serpapi(term, priority["name"], api_key, config["max_results_per_query"]):
-            process_job(job, priority["name"])
-
-    # Secondary metros: ALL of them, with rotated search terms
     terms_per_metro = config.get("secondary_terms_per_metro", 2)
+    tasks = [(term, priority["name"]) for term in pick_search_terms(config, priority["queries_per_run"])]
     for metro in config["secondary_metros"]:
-        metro_terms = pick_search_terms(config, terms_per_metro)
-        for term in metro_terms:
-            for job in query_serpapi(term, metro, api_key, config["max_results_per_query"]):
-                process_job(job, metro)
+        tasks.extend((term, metro) for term in pick_search_terms(config, terms_per_metro))
+
+    # Queries are independent and I/O-bound, so run them in parallel over the
+    # shared session. Results are processed on the main thread as they finish,
+    # keeping seen_ids / all_new_jobs mutation single-threaded.
+    max_results = config["max_results_per_query"]
+    response_cache = store.load_responses()
+    with ThreadPoolExecutor(max_workers=config.get("max_parallel_queries", 8)) as executor:
+        futures = {
+            executor.submit(query_serpapi, term, metro, api_key, max_results, response_cache):
+                (term, metro)
+            for term, metro in tasks
+        }
+        for future in as_completed(futures):
+            term, queried_metro = futures[future]
+            jobs = future.result()
+            # Unchanged result page since last run: nothing new, skip it
+            bunch_key = f"{term} | {queried_metro}"
+            page_hash = bunch_hash(jobs)
+            if store.get_bunch(bunch_key) == page_hash:
+                log.info(f"  Unchanged page for '{term}' in {queried_metro}; skipping {len(jobs)} jobs")
+                continue
+            store.set_bunch(bunch_key, page_hash)
+            for job in jobs:
+                metro = process_job_fused(job, queried_metro, store, run_stamp)
+                if metro:
+                    all_new_jobs.setdefault(metro, []).append(job)
 
-    total_queries = priority["queries_per_run"] + len(config["secondary_metros"]) * terms_per_metro
+    total_queries = len(tasks)
     log.info(f"Used {total_queries} API queries this run")
-    log.info(f"Filtered out {filtered_count} jobs (senior/irrelevant/high YOE)")
+    log.info(f"Filtered out {store.count_filtered() - initial_filtered} jobs (senior/irrelevant/high YOE)")
 
     # Sort each metro's jobs by relevancy
     for metro in all_new_jobs:
         all_new_jobs[metro] = sort_by_relevancy(all_new_jobs[metro])
 
-    # Save updated seen list
-    seen["seen_ids"] = list(seen_ids)
-    save_seen_jobs(seen)
+    # Persist the run's dedup writes and refreshed response cache
+    store.save_responses(response_cache)
+    store.commit()
 
     return all_new_jobs
 
@@ -409,6 +657,23 @@ def build_email_html(jobs_by_metro, config):
     return "\n".join(html_parts)
 
 
+# Per-card invariants, hoisted out of the render loop
+BG = ("#fafafa", "#ffffff")
+BADGE_TOP = "<span style='background:#22c55e;color:#fff;font-size:10px;padding:2px 6px;border-radius:4px;margin-left:8px;'>TOP MATCH</span>"
+BADGE_GOOD = "<span style='background:#3b82f6;color:#fff;font-size:10px;padding:2px 6px;border-radius:4px;margin-left:8px;'>GOOD FIT</span>"
+
+# One job card, filled per job via str.format_map on a precomputed view dict
+# instead of assembling many small f-strings.
+CARD_TEMPLATE = (
+    "<div style='padding: 12px 14px; background: {bg}; border-radius: 6px; margin-bottom: 4px;'>"
+    "<div style='font-size: 15px; font-weight: 600;'>{title_html}{badge}</div>"
+    "<div style='font-size: 13px; color: #555; margin-top: 4px;'>"
+    "{company} &bull; {location}</div>"
+    "<div style='font-size: 12px; color: #999; margin-top: 2px;'>{posted}</div>"
+    "</div>"
+)
+
+
 def render_metro_section(metro, jobs, is_priority=False):
     """Render one city's job listings as HTML."""
     if is_priority:
@@ -428,33 +693,27 @@ def render_metro_section(metro, jobs, is_priority=False):
     parts = [header]
 
     for i, job in enumerate(jobs):
-        title = job.get("title", "Unknown Title")
-        company = job.get("company_name", "Unknown Company")
-        location = job.get("location", metro)
-        posted = job.get("detected_extensions", {}).get("posted_at", "Recently")
+        # Escape everything that came from the API before it hits HTML
+        title = html.escape(job.get("title", "Unknown Title"))
         apply_link = extract_apply_link(job)
 
         # Relevancy badge for top 3
-        badge = ""
-        if i == 0:
-            badge = "<span style='background:#22c55e;color:#fff;font-size:10px;padding:2px 6px;border-radius:4px;margin-left:8px;'>TOP MATCH</span>"
-        elif i <= 2:
-            badge = "<span style='background:#3b82f6;color:#fff;font-size:10px;padding:2px 6px;border-radius:4px;margin-left:8px;'>GOOD FIT</span>"
+        badge = BADGE_TOP if i == 0 else (BADGE_GOOD if i <= 2 else "")
 
         if apply_link:
-            title_html = f'<a href="{apply_link}" style="color: #0066cc; text-decoration: none;">{title}</a>'
+            title_html = f'<a href="{html.escape(apply_link)}" style="color: #0066cc; text-decoration: none;">{title}</a>'
         else:
             title_html = title
 
-        bg = "#fafafa" if i % 2 == 0 else "#ffffff"
-        parts.append(
-            f"<div style='padding: 12px 14px; background: {bg}; border-radius: 6px; margin-bottom: 4px;'>"
-            f"<div style='font-size: 15px; font-weight: 600;'>{title_html}{badge}</div>"
-            f"<div style='font-size: 13px; color: #555; margin-top: 4px;'>"
-            f"{company} &bull; {location}</div>"
-            f"<div style='font-size: 12px; color: #999; margin-top: 2px;'>{posted}</div>"
-            f"</div>"
-        )
+        view = {
+            "bg": BG[i & 1],
+            "title_html": title_html,
+            "badge": badge,
+            "company": html.escape(job.get("company_name", "Unknown Company")),
+            "location": html.escape(job.get("location", metro)),
+            "posted": html.escape(job.get("detected_extensions", {}).get("posted_at", "Recently")),
+        }
+        parts.append(CARD_TEMPLATE.format_map(view))
     return "\n".join(parts)
 
 
@@ -520,14 +779,17 @@ def main():
 
     if args.dry_run:
         log.info(f"[DRY RUN] Would send email with {total} jobs")
+        # Buffer the summary and write it once; per-line print calls each
+        # lock and flush stdout, which adds up on redirected CI logs
+        lines = []
         for metro, jobs in jobs_by_metro.items():
-            print(f"\n{'='*60}")
-            print(f"  {metro} ({len(jobs)} jobs)")
-            print(f"{'='*60}")
+            sep = "=" * 60
+            lines.append(f"\n{sep}\n  {metro} ({len(jobs)} jobs)\n{sep}\n")
             for i, job in enumerate(jobs):
-                score = relevancy_score(job)
                 tag = " [TOP MATCH]" if i == 0 else (" [GOOD FIT]" if i <= 2 else "")
-                print(f"  {score:3d}pts | {job.get('title', '?')} @ {job.get('company_name', '?')}{tag}")
+                lines.append(
+                    f"  {job['_score']:3d}pts | {job.get('title', '?')} @ {job.get('company_name', '?')}{tag}\n")
+        sys.stdout.write("".join(lines))
         out = REPO_ROOT / "preview_email.html"
         out.write_text(html, encoding="utf-8")
         log.info(f"Email preview written to {out}")